@@ -0,0 +1,6 @@
+"""Candidate classification: keyword NLP categories and LLM summaries for leads.
+
+Submodules are intentionally not imported here, so that `import
+candidate_classification_project` (and the CLI) stays cheap. Import
+`nlp_script`, `openai_script` or `run_both` directly when they are needed.
+"""
@@ -0,0 +1,248 @@
+"""Command line entry point: `candidate-classify nlp|llm|both|serve|queue`.
+
+Only argparse and the standard library are imported at module load. Each
+subcommand imports the pipeline it runs (and through it pandas, nltk or openai)
+when it is dispatched, so e.g. `candidate-classify nlp` never loads the OpenAI
+client and `--help` loads neither.
+"""
+import argparse
+import os
+import sys
+
+
+def add_file_args(parser):
+    parser.add_argument(
+        "--file_name", type=str, default="Anonymized Leads.xlsx",
+        help="Name of the Excel file to process"
+    )
+
+
+def add_llm_args(parser):
+    parser.add_argument(
+        "--api_key", type=str, default=os.getenv("OPEN_API_KEY"),
+        help="API key for authentication (default reads from OPEN_API_KEY env variable)"
+    )
+    parser.add_argument("--row_start", type=int, default=None, help="Start row (inclusive)")
+    parser.add_argument("--row_end", type=int, default=None, help="End row (exclusive)")
+
+
+def add_profile_args(parser):
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Write CPU/memory profile reports (<results>_profile.txt/.collapsed) next to the results"
+    )
+    parser.add_argument("--profile_top", type=int, default=30, help="Functions listed in the profile summary (default=30)")
+
+
+def preflight_nltk():
+    """Check NLTK resources once, before any work starts"""
+    from candidate_classification_project.nlp_script import check_nltk_resources
+
+    try:
+        check_nltk_resources()
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def run_nlp(args):
+    preflight_nltk()
+    from candidate_classification_project import profiling
+    from candidate_classification_project.nlp_script import OUTPUT_FILE, process_nlp_responses
+
+    with profiling.profile_run(args.profile, OUTPUT_FILE, top_n=args.profile_top):
+        process_nlp_responses(file_name=args.file_name)
+
+
+def run_llm(args):
+    import asyncio
+    from candidate_classification_project import profiling
+    from candidate_classification_project.openai_script import OUTPUT_FILE, process_llm_responses
+
+    with profiling.profile_run(args.profile, OUTPUT_FILE, top_n=args.profile_top):
+        asyncio.run(process_llm_responses(
+            file_name=args.file_name,
+            api_key=args.api_key,
+            batch_size=args.batch_size,
+            row_start=args.row_start,
+            row_end=args.row_end,
+            concurrency=args.concurrency
+        ))
+
+
+def run_both(args):
+    preflight_nltk()
+    from candidate_classification_project import profiling
+    from candidate_classification_project import run_both as both
+
+    with profiling.profile_run(args.profile, both.OUTPUT_FILE, top_n=args.profile_top):
+        both.main(
+            file_name=args.file_name,
+            api_key=args.api_key,
+            row_start=args.row_start,
+            row_end=args.row_end
+        )
+
+
+def run_serve(args):
+    preflight_nltk()
+    from candidate_classification_project.service import serve
+
+    serve(
+        host=args.host,
+        port=args.port,
+        api_key=args.api_key,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency
+    )
+
+
+def run_queue_submit(args):
+    from candidate_classification_project.work_queue import WorkQueue
+
+    kinds = ("nlp", "llm") if args.kind == "both" else (args.kind,)
+    queue = WorkQueue(args.db)
+    try:
+        added = queue.submit(
+            file_name=args.file_name,
+            kinds=kinds,
+            chunk_size=args.chunk_size,
+            batch_size=args.batch_size,
+            row_start=args.row_start,
+            row_end=args.row_end
+        )
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        queue.close()
+    print(f"✅ Queued {added} jobs in {args.db}")
+
+
+def run_queue_work(args):
+    preflight_nltk()
+    from candidate_classification_project.work_queue import run_workers
+
+    run_workers(
+        args.db,
+        processes=args.processes,
+        api_key=args.api_key,
+        lease_seconds=args.lease_seconds,
+        max_attempts=args.max_attempts,
+        wait=args.wait
+    )
+
+
+def run_queue_status(args):
+    from candidate_classification_project.work_queue import WorkQueue
+
+    queue = WorkQueue(args.db)
+    try:
+        if args.retry_failed:
+            print(f"🔁 Reset {queue.retry_failed()} failed jobs to pending")
+        for kind, statuses in sorted(queue.status_counts().items()):
+            print(f"{kind}: " + ", ".join(f"{status}={n}" for status, n in sorted(statuses.items())))
+    finally:
+        queue.close()
+
+
+def run_queue_merge(args):
+    from candidate_classification_project.work_queue import merge_results
+
+    try:
+        merge_results(args.db, output_file=args.output, allow_partial=args.allow_partial)
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def add_queue_parser(subparsers):
+    queue_parser = subparsers.add_parser("queue", help="Shard NLP/LLM jobs over many workers via a shared SQLite queue")
+    queue_subparsers = queue_parser.add_subparsers(dest="queue_command", required=True)
+
+    def add_db_arg(parser):
+        parser.add_argument("--db", type=str, default="work_queue.sqlite", help="Queue file shared by all workers")
+
+    submit_parser = queue_subparsers.add_parser("submit", help="Split a leads file into queued jobs")
+    add_db_arg(submit_parser)
+    add_file_args(submit_parser)
+    submit_parser.add_argument("--kind", choices=["nlp", "llm", "both"], default="both", help="Which jobs to queue")
+    submit_parser.add_argument("--chunk_size", type=int, default=500, help="Rows per NLP job (default=500)")
+    submit_parser.add_argument("--batch_size", type=int, default=10, help="Rows per LLM job (default=10)")
+    submit_parser.add_argument("--row_start", type=int, default=None, help="Start row (inclusive)")
+    submit_parser.add_argument("--row_end", type=int, default=None, help="End row (exclusive)")
+    submit_parser.set_defaults(func=run_queue_submit)
+
+    work_parser = queue_subparsers.add_parser("work", help="Lease and run jobs until the queue is drained")
+    add_db_arg(work_parser)
+    work_parser.add_argument(
+        "--api_key", type=str, default=os.getenv("OPEN_API_KEY"),
+        help="API key for LLM jobs (default reads from OPEN_API_KEY env variable)"
+    )
+    work_parser.add_argument("--processes", type=int, default=1, help="Worker processes to start on this host (default=1)")
+    work_parser.add_argument("--lease_seconds", type=float, default=600, help="Seconds before an unfinished job is handed out again (default=600)")
+    work_parser.add_argument("--max_attempts", type=int, default=3, help="Attempts before a job is marked failed (default=3)")
+    work_parser.add_argument("--wait", action="store_true", help="Keep polling for new jobs instead of exiting when drained")
+    work_parser.set_defaults(func=run_queue_work)
+
+    status_parser = queue_subparsers.add_parser("status", help="Show job counts by kind and status")
+    add_db_arg(status_parser)
+    status_parser.add_argument("--retry_failed", action="store_true", help="Reset failed jobs to pending first")
+    status_parser.set_defaults(func=run_queue_status)
+
+    merge_parser = queue_subparsers.add_parser("merge", help="Write all committed results to one workbook")
+    add_db_arg(merge_parser)
+    merge_parser.add_argument("--output", type=str, default="all_columns.xlsx", help="Output workbook (default=all_columns.xlsx)")
+    merge_parser.add_argument("--allow_partial", action="store_true", help="Merge even if some jobs are not done")
+    merge_parser.set_defaults(func=run_queue_merge)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="candidate-classify",
+        description="Classify candidate leads with keyword NLP and/or LLM summaries."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    nlp_parser = subparsers.add_parser("nlp", help="Run the NLP keyword categories")
+    add_file_args(nlp_parser)
+    add_profile_args(nlp_parser)
+    nlp_parser.set_defaults(func=run_nlp)
+
+    llm_parser = subparsers.add_parser("llm", help="Run the LLM summary and career goals")
+    add_file_args(llm_parser)
+    add_llm_args(llm_parser)
+    llm_parser.add_argument("--batch_size", type=int, default=10, help="Batch size (default=10)")
+    llm_parser.add_argument("--concurrency", type=int, default=3, help="Number of parallel requests (default=3)")
+    add_profile_args(llm_parser)
+    llm_parser.set_defaults(func=run_llm)
+
+    both_parser = subparsers.add_parser("both", help="Run NLP and LLM and merge all output columns")
+    add_file_args(both_parser)
+    add_llm_args(both_parser)
+    add_profile_args(both_parser)
+    both_parser.set_defaults(func=run_both)
+
+    serve_parser = subparsers.add_parser("serve", help="Run the warm classification service (JSON over HTTP)")
+    serve_parser.add_argument("--host", type=str, default="127.0.0.1", help="Interface to bind (default=127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default=8765)")
+    serve_parser.add_argument(
+        "--api_key", type=str, default=os.getenv("OPEN_API_KEY"),
+        help="API key for /llm (default reads from OPEN_API_KEY env variable)"
+    )
+    serve_parser.add_argument("--batch_size", type=int, default=10, help="LLM batch size (default=10)")
+    serve_parser.add_argument("--concurrency", type=int, default=3, help="Number of parallel LLM requests (default=3)")
+    serve_parser.set_defaults(func=run_serve)
+
+    add_queue_parser(subparsers)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
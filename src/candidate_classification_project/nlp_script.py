@@ -1,22 +1,89 @@
-import pandas as pd
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.stem import WordNetLemmatizer
 import os
 import argparse
+from functools import lru_cache
 
-# Download NLTK resources if needed
-# nltk.download('punkt')
-# nltk.download('stopwords')
-# nltk.download('wordnet')
-# nltk.download('punkt_tab')
+if __package__:
+    from . import profiling
+else:  # run directly as a script, e.g. python src/candidate_classification_project/nlp_script.py
+    import profiling
+
+# pandas and nltk are imported inside the functions that use them, so importing
+# this module (e.g. from the CLI) stays cheap until a run actually starts.
+
+# NLTK resources needed by preprocess/summarize, as (nltk.data path, download id)
+NLTK_RESOURCES = [
+    ("tokenizers/punkt_tab", "punkt_tab"),
+    ("corpora/stopwords", "stopwords"),
+    ("corpora/wordnet", "wordnet"),
+]
+
+DROP_COLUMNS = ['Name', 'Email', 'Data sharing consent']
+NAME_COLUMN = '[*] Full name'
+OUTPUT_FILE = os.path.join(os.path.expanduser("~"), "Desktop", "nlp_results.xlsx")
+
+# To edit the categories, update the keywords below
+DEFAULT_CATEGORIES = {
+    "EA Keyword": ["80,000 hours", "80k", "gwwc", "giving what we can", "10% pledge"],
+    "X Sensitive": ["ai x-risk", "agi safety", "existential risk"],
+    "Social": ["justice", "equity", "inequality", "marginalized", "oppression", "social concern"],
+    "Management": ["manage", "supervise", "lead", "led", "managed", "oversaw", "directed", "organized", "coordinated"]
+}
+
+def missing_nltk_resources():
+    """Return the download ids of any NLTK resources that are not installed"""
+    import nltk
+
+    missing = []
+    for path, download_id in NLTK_RESOURCES:
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(download_id)
+    return missing
+
+def check_nltk_resources():
+    """Fail fast, before any rows are processed, if NLTK resources are missing"""
+
+    missing = missing_nltk_resources()
+    if missing:
+        raise RuntimeError(
+            f"Missing NLTK resources: {', '.join(missing)}. "
+            f"Install them with: python -m nltk.downloader {' '.join(missing)}"
+        )
+
+@lru_cache(maxsize=None)
+def get_lemmatizer():
+    """Build the WordNet lemmatizer once per process"""
+    from nltk.stem import WordNetLemmatizer
+
+    return WordNetLemmatizer()
+
+@lru_cache(maxsize=None)
+def get_stop_words():
+    """Load the English stopword corpus once per process"""
+    from nltk.corpus import stopwords
+
+    return frozenset(stopwords.words("english"))
+
+def warm_up():
+    """Load the NLTK corpora now rather than on the first row processed"""
+
+    preprocess("warm up")
+
+def compile_categories(categories: dict):
+    """Freeze categories into (name, keywords, terms column) tuples for repeated use"""
+
+    return tuple(
+        (cat_name, tuple(keywords), f"{cat_name} Terms Found")
+        for cat_name, keywords in categories.items()
+    )
 
 def preprocess(text):
     """Preprocess text"""
+    from nltk.tokenize import word_tokenize
 
-    lemmatizer = WordNetLemmatizer()
-    stop_words = set(stopwords.words("english"))
+    lemmatizer = get_lemmatizer()
+    stop_words = get_stop_words()
 
     if not isinstance(text, str):
         return ""
@@ -31,46 +98,148 @@ def find_keywords(text, keywords, preprocess_text=False):
     found = [kw for kw in keywords if kw in text_to_check]
     return found
 
+def to_records(df):
+    """DataFrame -> list of JSON-safe dicts (NaN becomes null)"""
+    import pandas as pd
+
+    return df.astype(object).where(pd.notna(df), None).to_dict("records")
+
 def summarize(text, n=2):
     """Naive summarizer: return first 1–2 sentences"""
+    from nltk.tokenize import sent_tokenize
 
     if not isinstance(text, str):
         return ""
     sentences = sent_tokenize(text)
     return " ".join(sentences[:n])
 
-def process_row(row, categories: dict):
-    """Process each row of the DataFrame using dynamic keyword categories"""
+def process_row(row, categories):
+    """Process each row of the DataFrame using dynamic keyword categories
+
+    categories is either a {name: keywords} dict or the output of compile_categories.
+    """
+    import pandas as pd
+
+    if isinstance(categories, dict):
+        categories = compile_categories(categories)
 
     profile_text = " ".join(str(row[col]) for col in row.index if pd.notna(row[col]))
     clean_text = preprocess(profile_text)
 
     results = {}
-    for cat_name, keywords in categories.items():
+    for cat_name, keywords, terms_column in categories:
         found = find_keywords(clean_text, keywords, preprocess_text=False)
         results[cat_name] = bool(found)
-        results[f"{cat_name} Terms Found"] = ", ".join(found)
+        results[terms_column] = ", ".join(found)
 
     return results
 
-def process_nlp_responses(file_name: str, categories: dict):
-    df = pd.read_excel(file_name)
-    df = df.drop(columns=['Name', 'Email', 'Data sharing consent'])
+class NLPResults:
+    """Compact NLP output: one packed category bitmask per row plus interned term codes.
+
+    Bit i of mask[row] is set when category i matched. For each category,
+    term_codes[name] holds a small integer per row indexing term_values[name],
+    the distinct ", "-joined term strings seen. The readable True/False and
+    "Terms Found" columns are only built by to_frame(), at export time.
+    """
+
+    def __init__(self, names, categories, mask, term_codes, term_values):
+        self.names = names
+        self.categories = categories
+        self.mask = mask
+        self.term_codes = term_codes
+        self.term_values = term_values
+
+    def __len__(self):
+        return len(self.mask)
+
+    def to_frame(self, include_name=True):
+        """Materialize the readable columns: '[*] Full name', one bool per category, then terms"""
+        import pandas as pd
+
+        columns = {}
+        if include_name and self.names is not None:
+            columns[NAME_COLUMN] = self.names
+        for bit, (cat_name, _, _) in enumerate(self.categories):
+            columns[cat_name] = ((self.mask >> bit) & 1).astype(bool)
+        for cat_name, _, terms_column in self.categories:
+            terms = pd.Categorical.from_codes(self.term_codes[cat_name], categories=self.term_values[cat_name])
+            columns[terms_column] = terms.astype(object)
+        return pd.DataFrame(columns)
+
+def mask_dtype(n_categories: int):
+    """Smallest unsigned integer dtype with one bit per category"""
+    import numpy as np
+
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if n_categories <= np.iinfo(dtype).bits:
+            return dtype
+    raise ValueError(f"At most 64 NLP categories are supported, got {n_categories}")
+
+def consume_profile_texts(df):
+    """Join each row's non-empty cells into one profile string
+
+    Columns are popped from df as they are read, leaving it empty. A frame
+    straight from read_excel keeps its text in one shared block, so the cells
+    are only released once the last column is popped: peak memory is the frame
+    plus the joined strings, not one copy of each. classify_frame then frees
+    each joined string as soon as it has been tokenized.
+    """
+    import pandas as pd
+
+    parts = [[] for _ in range(len(df))]
+    for col in list(df.columns):
+        for row_parts, value in zip(parts, df.pop(col)):
+            if pd.notna(value):
+                row_parts.append(str(value))
+    return [" ".join(row_parts) for row_parts in parts]
+
+def classify_frame(df, categories):
+    """Classify every row of df into an NLPResults. Consumes df: its columns are dropped."""
+    import numpy as np
+
+    if isinstance(categories, dict):
+        categories = compile_categories(categories)
+
+    names = df[NAME_COLUMN].reset_index(drop=True) if NAME_COLUMN in df.columns else None
+    texts = consume_profile_texts(df)
+
+    mask = np.zeros(len(texts), dtype=mask_dtype(len(categories)))
+    term_codes = {cat_name: np.zeros(len(texts), dtype=np.int32) for cat_name, _, _ in categories}
+    interned = {cat_name: {"": 0} for cat_name, _, _ in categories}
+
+    for i in range(len(texts)):
+        clean_text = preprocess(texts[i])
+        texts[i] = None  # raw text is no longer needed once tokenized
+
+        for bit, (cat_name, keywords, _) in enumerate(categories):
+            found = find_keywords(clean_text, keywords, preprocess_text=False)
+            if found:
+                mask[i] |= 1 << bit
+            codes = interned[cat_name]
+            term_codes[cat_name][i] = codes.setdefault(", ".join(found), len(codes))
+
+    term_values = {cat_name: list(codes) for cat_name, codes in interned.items()}
+    return NLPResults(names, categories, mask, term_codes, term_values)
+
+def process_nlp_responses(file_name: str, categories: dict = None):
+    import pandas as pd
+
+    categories = categories or DEFAULT_CATEGORIES
+    with profiling.stage("read_excel"):
+        df = pd.read_excel(file_name, usecols=lambda col: col not in DROP_COLUMNS)
 
     # Run NLP
-    results = df.apply(lambda row: process_row(row, categories), axis=1, result_type="expand")
-    df_out = pd.concat([df, results], axis=1)
+    with profiling.stage("classify"):
+        results = classify_frame(df, categories)
 
     # Keep only full name + NLP output columns
-    nlp_columns = list(categories.keys())
-    terms_columns = [f"{cat} Terms Found" for cat in categories.keys()]
-    columns_to_keep = ['[*] Full name'] + nlp_columns + terms_columns
-
-    df_out = df_out[[col for col in columns_to_keep if col in df_out.columns]]
+    df_out = results.to_frame()
 
     # Export
-    output_file = os.path.join(os.path.expanduser("~"), "Desktop", "nlp_results.xlsx")
-    df_out.to_excel(output_file, index=False)
+    output_file = OUTPUT_FILE
+    with profiling.stage("to_excel"):
+        df_out.to_excel(output_file, index=False)
     print(f"✅ Done! Saved to {output_file}")
 
     return df_out
@@ -84,8 +253,15 @@ if __name__ == "__main__":
         help="Name of the Excel file to process"
     )
 
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Write CPU/memory profile reports next to the results"
+    )
+
     args = parser.parse_args()
 
-    process_nlp_responses(
-        file_name=args.file_name,
-    )
\ No newline at end of file
+    check_nltk_resources()
+    with profiling.profile_run(args.profile, OUTPUT_FILE):
+        process_nlp_responses(
+            file_name=args.file_name,
+        )
@@ -1,13 +1,20 @@
-import pandas as pd
-from openai import AsyncOpenAI
-from tqdm.asyncio import tqdm_asyncio
 import json
 import argparse
 import os
 import time
 from datetime import datetime
 import asyncio
-import anthropic
+
+if __package__:
+    from . import profiling
+else:  # run directly as a script, e.g. python src/candidate_classification_project/openai_script.py
+    import profiling
+
+# pandas, openai and tqdm are imported inside process_llm_responses so that
+# importing this module (e.g. from the CLI) does not pay for them up front.
+# The anthropic SDK is only needed for the Claude path and is not a dependency.
+
+OUTPUT_FILE = "llm_results.xlsx"
 
 def build_batch_prompts(df, batch):
     """Builds a single prompt string for a batch of candidate profiles."""
@@ -120,18 +127,39 @@ async def get_chatgpt_batch_response(client, prompt, batch_idx, semaphore):
             return batch_idx, [], {"error": str(e)}
 
 
+def combine_batch_output(batch, responses):
+    """Attaches the parsed LLM responses for a batch as new columns alongside its rows."""
+    import pandas as pd
+
+    if isinstance(responses, list):
+        batch_out = pd.DataFrame(responses)
+    else:
+        batch_out = pd.DataFrame([responses])
+
+    batch_out = batch_out.reset_index(drop=True)
+    batch = batch.reset_index(drop=True)
+
+    return pd.concat([batch, batch_out], axis=1)
+
+
 async def process_llm_responses(file_name: str, api_key: str, batch_size: int = 10,
                                 row_start: int = None, row_end: int = None, concurrency: int = 3):
     """Processes candidates in batches using GPT-5 asynchronously and saves incremental output."""
+    import pandas as pd
+    from openai import AsyncOpenAI
+    from tqdm.asyncio import tqdm_asyncio
+
     client = AsyncOpenAI(api_key=api_key)
+    # import anthropic
     # client = anthropic.Client(api_key=os.getenv("CLAUDE_API_KEY"))
-    df = pd.read_excel(file_name)
+    with profiling.stage("read_excel"):
+        df = pd.read_excel(file_name)
     df = df.drop(columns=['Name', 'Email', 'Data sharing consent'], errors="ignore")
 
     if row_start or row_end:
         df = df.iloc[row_start:row_end]
 
-    output_file = "llm_results.xlsx"
+    output_file = OUTPUT_FILE
     token_log_file = "token_log.csv"
 
     # Prepare log file if not exists
@@ -156,38 +184,39 @@ async def process_llm_responses(file_name: str, api_key: str, batch_size: int =
         # tasks.append(get_claude_batch_response(client, prompt, batch_idx, semaphore))
 
     start_time = time.time()
-    results = await tqdm_asyncio.gather(*tasks)
+    with profiling.stage("llm_requests"):
+        results = await tqdm_asyncio.gather(*tasks)
     total_duration = round(time.time() - start_time, 2)
 
-    for batch_idx, responses, token_info in results:
-        batch = batches[batch_idx]
-
-        if isinstance(responses, list):
-            batch_out = pd.DataFrame(responses)
-        else:
-            batch_out = pd.DataFrame([responses])
-
-        batch_out.reset_index(drop=True, inplace=True)
-        batch.reset_index(drop=True, inplace=True)
-
-        df_out = pd.concat([batch, batch_out], axis=1)
-        existing = pd.concat([existing, df_out], ignore_index=True)
-        existing.to_excel(output_file, index=False)
-
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "batch_start": batch_idx * batch_size,
-            "batch_end": batch_idx * batch_size + len(batch),
-            **token_info
-        }
-        pd.DataFrame([log_entry]).to_csv(token_log_file, mode='a', header=False, index=False)
+    # The workbook is rewritten after every batch; profile the loop as one stage, not one per batch
+    # existing (rows from earlier runs) is only for the incremental workbook;
+    # this run's rows are collected separately and returned
+    run_frames = []
+    with profiling.stage("to_excel"):
+        for batch_idx, responses, token_info in results:
+            batch = batches[batch_idx]
+
+            df_out = combine_batch_output(batch, responses)
+            run_frames.append(df_out)
+            existing = pd.concat([existing, df_out], ignore_index=True)
+            existing.to_excel(output_file, index=False)
+
+            log_entry = {
+                "timestamp": datetime.now().isoformat(),
+                "batch_start": batch_idx * batch_size,
+                "batch_end": batch_idx * batch_size + len(batch),
+                **token_info
+            }
+            pd.DataFrame([log_entry]).to_csv(token_log_file, mode='a', header=False, index=False)
 
-        print(f"✅ Batch {batch_idx} done | Tokens: {token_info.get('total_tokens')} | Time: {token_info.get('duration_sec')}s")
+            print(f"✅ Batch {batch_idx} done | Tokens: {token_info.get('total_tokens')} | Time: {token_info.get('duration_sec')}s")
 
     print(f"🏁 All batches processed successfully in {total_duration}s!")
     print(f"Results saved to: {output_file}")
     print(f"Token usage log saved to: {token_log_file}")
 
+    return pd.concat(run_frames, ignore_index=True) if run_frames else df.iloc[0:0]
+
 
 def main():
     parser = argparse.ArgumentParser(description="Run GPT-5 batch summarization.")
@@ -197,17 +226,19 @@ def main():
     parser.add_argument("--row_start", type=int, default=None)
     parser.add_argument("--row_end", type=int, default=None)
     parser.add_argument("--concurrency", type=int, default=3, help="Number of parallel requests (default=3)")
+    parser.add_argument("--profile", action="store_true", help="Write CPU/memory profile reports next to the results")
 
     args = parser.parse_args()
 
-    asyncio.run(process_llm_responses(
-        file_name=args.file_name,
-        api_key=args.api_key,
-        batch_size=args.batch_size,
-        row_start=args.row_start,
-        row_end=args.row_end,
-        concurrency=args.concurrency
-    ))
+    with profiling.profile_run(args.profile, OUTPUT_FILE):
+        asyncio.run(process_llm_responses(
+            file_name=args.file_name,
+            api_key=args.api_key,
+            batch_size=args.batch_size,
+            row_start=args.row_start,
+            row_end=args.row_end,
+            concurrency=args.concurrency
+        ))
 
 
 if __name__ == "__main__":
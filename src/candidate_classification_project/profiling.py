@@ -0,0 +1,228 @@
+"""Opt-in profiling for the nlp, llm and both runs (`--profile`).
+
+Pipeline code marks its stages with `with profiling.stage("read_excel"): ...`.
+While no profile is running, stage() hands back one shared no-op context
+manager, and cProfile/tracemalloc are never imported, so the option costs
+nothing when it is off.
+
+With `profile_run(True, results_file)` active, three things are recorded:
+
+- cProfile over the whole run, for the top-N functions by cumulative and own time
+- tracemalloc per stage: wall time, net allocation and peak; plus top allocation
+  sites for the first call of each top-level stage (snapshots are slow with many
+  live objects, so repeated and nested stages only read the traced totals)
+- a sampling thread that snapshots the main thread's stack every few ms,
+  prefixed with the active stage names, for flamegraphs
+
+and two files are written next to the results file:
+
+    <results>_profile.txt        top-N text summary
+    <results>_profile.collapsed  collapsed stacks ("frame;frame;frame count"), e.g.
+                                 for flamegraph.pl or speedscope
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+_NO_STAGE = nullcontext()
+_active = None
+
+
+def stage(name: str):
+    """Mark a pipeline stage; a no-op unless a profile is running"""
+    if _active is None:
+        return _NO_STAGE
+    return _active.stage(name)
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval into collapsed-stack counts."""
+
+    def __init__(self, thread_id, stage_names, interval=0.005):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.stage_names = stage_names
+        self.interval = interval
+        self.counts = Counter()
+        self.stopped = threading.Event()
+        self.paused = False
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            if self.paused:
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            stack.reverse()
+            prefix = [f"[{name}]" for name in list(self.stage_names)]
+            self.counts[";".join(prefix + stack)] += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class StageStats:
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.net_bytes = 0
+        self.peak_bytes = 0
+        self.sites = Counter()
+
+
+class Profiler:
+    """Collects CPU, allocation and stack samples for one run."""
+
+    def __init__(self, top_n: int = 30, interval: float = 0.005):
+        self.top_n = top_n
+        self.interval = interval
+        self.stage_names = []
+        self.stage_peaks = []
+        self.stats = {}
+        self.snapshotted = set()
+        self.overhead = 0.0
+
+    def start(self):
+        import cProfile
+        import tracemalloc
+
+        self.started = time.perf_counter()
+        tracemalloc.start(1)
+        self.sampler = StackSampler(threading.get_ident(), self.stage_names, self.interval)
+        self.sampler.start()
+        self.cpu = cProfile.Profile()
+        self.cpu.enable()
+
+    def stop(self):
+        import tracemalloc
+
+        self.cpu.disable()
+        self.sampler.stop()
+        self.wall = time.perf_counter() - self.started
+        self.peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    @contextmanager
+    def paused(self):
+        """Keep the profiler's own snapshot work out of the CPU profile, samples and stage times"""
+        self.cpu.disable()
+        self.sampler.paused = True
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.overhead += time.perf_counter() - start
+            self.sampler.paused = False
+            self.cpu.enable()
+
+    @contextmanager
+    def stage(self, name: str):
+        import tracemalloc
+
+        with self.paused():
+            # Peaks are tracked per stage; fold the peak so far into the enclosing stage before resetting
+            current, peak = tracemalloc.get_traced_memory()
+            if self.stage_peaks:
+                self.stage_peaks[-1] = max(self.stage_peaks[-1], peak)
+            tracemalloc.reset_peak()
+
+            before = None
+            if not self.stage_names and name not in self.snapshotted:
+                self.snapshotted.add(name)
+                before = tracemalloc.take_snapshot()
+            self.stage_names.append(name)
+            self.stage_peaks.append(current)
+        overhead_at_start = self.overhead
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start - (self.overhead - overhead_at_start)
+            with self.paused():
+                self.stage_names.pop()
+                stage_peak = max(self.stage_peaks.pop(), tracemalloc.get_traced_memory()[1])
+                if self.stage_peaks:
+                    self.stage_peaks[-1] = max(self.stage_peaks[-1], stage_peak)
+
+                stats = self.stats.setdefault(name, StageStats())
+                stats.calls += 1
+                stats.wall += wall
+                stats.net_bytes += tracemalloc.get_traced_memory()[0] - current
+                stats.peak_bytes = max(stats.peak_bytes, stage_peak)
+                if before is not None:
+                    after = tracemalloc.take_snapshot()
+                    for diff in after.compare_to(before, "lineno")[:self.top_n]:
+                        frame = diff.traceback[0]
+                        if diff.size_diff > 0 and frame.filename not in (__file__, tracemalloc.__file__):
+                            stats.sites[f"{frame.filename}:{frame.lineno}"] += diff.size_diff
+
+    def write(self, base_path: str):
+        """Write <base_path>_profile.txt and <base_path>_profile.collapsed; returns both paths"""
+        import io
+        import pstats
+
+        summary_file = f"{base_path}_profile.txt"
+        collapsed_file = f"{base_path}_profile.collapsed"
+
+        with open(collapsed_file, "w") as f:
+            for stack, count in self.sampler.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+        mb = 1024 * 1024
+        lines = [
+            f"Total wall time: {self.wall:.2f}s (of which {self.overhead:.2f}s profiler snapshots, "
+            f"excluded from stage times) | traced peak memory: {self.peak_bytes / mb:.1f} MB "
+            f"| stack samples: {sum(self.sampler.counts.values())} every {self.interval * 1000:.0f}ms",
+            "",
+            "Stages (wall time, net allocation, peak traced memory)",
+            f"{'stage':<20}{'calls':>7}{'wall s':>10}{'net MB':>10}{'peak MB':>10}",
+        ]
+        for name, stats in sorted(self.stats.items(), key=lambda item: -item[1].wall):
+            lines.append(
+                f"{name:<20}{stats.calls:>7}{stats.wall:>10.2f}"
+                f"{stats.net_bytes / mb:>10.1f}{stats.peak_bytes / mb:>10.1f}"
+            )
+        for name, stats in self.stats.items():
+            if stats.sites:
+                lines += ["", f"Top allocation sites in {name} (first call)"]
+                lines += [f"  {size / mb:8.2f} MB  {site}" for site, size in stats.sites.most_common(5)]
+
+        for sort_key in ("cumulative", "tottime"):
+            out = io.StringIO()
+            pstats.Stats(self.cpu, stream=out).sort_stats(sort_key).print_stats(self.top_n)
+            lines += ["", f"Top {self.top_n} functions by {sort_key}", out.getvalue()]
+
+        with open(summary_file, "w") as f:
+            f.write("\n".join(lines))
+        return summary_file, collapsed_file
+
+
+@contextmanager
+def profile_run(enabled: bool, results_file: str, top_n: int = 30):
+    """Profile the enclosed run if enabled, writing reports next to results_file"""
+    global _active
+
+    if not enabled:
+        yield None
+        return
+
+    profiler = Profiler(top_n=top_n)
+    _active = profiler
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _active = None
+        summary_file, collapsed_file = profiler.write(os.path.splitext(results_file)[0])
+        print(f"📊 Profile saved to {summary_file} and {collapsed_file}")
@@ -1,18 +1,26 @@
-import pandas as pd
-from candidate_classification_project.nlp_script import process_nlp_responses
-from candidate_classification_project.openai_script import process_llm_responses
-from candidate_classification_project import OPEN_API_KEY
 import argparse
+import asyncio
 import os
 
+from candidate_classification_project import profiling
+
+OUTPUT_FILE = "all_columns.xlsx"
+
 def main(file_name, api_key, row_start, row_end):
-    nlp_df = process_nlp_responses(file_name)
-    llm_df = process_llm_responses(file_name, api_key, row_start, row_end)
-    final_df = pd.merge(nlp_df, llm_df, on='Full name')
+    import pandas as pd
+    from candidate_classification_project.nlp_script import process_nlp_responses
+    from candidate_classification_project.openai_script import process_llm_responses
+
+    with profiling.stage("nlp"):
+        nlp_df = process_nlp_responses(file_name)
+    with profiling.stage("llm"):
+        llm_df = asyncio.run(process_llm_responses(file_name, api_key, row_start=row_start, row_end=row_end))
+    final_df = pd.merge(nlp_df, llm_df, on='[*] Full name')
 
     # Save the final output
-    final_df.to_excel("all_columns.xlsx", index=False)
-    print("✅ Done! Saved to all_columns.xlsx")
+    with profiling.stage("to_excel"):
+        final_df.to_excel(OUTPUT_FILE, index=False)
+    print(f"✅ Done! Saved to {OUTPUT_FILE}")
 
 if __name__ == "__main__":
 
@@ -34,12 +42,20 @@ if __name__ == "__main__":
         "--row_end", type=int, default=None,
         help="End row (exclusive)"
     )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Write CPU/memory profile reports next to the results"
+    )
 
     args = parser.parse_args()
 
-    main(
-        file_name=args.file_name,
-        api_key=args.api_key,
-        row_start=args.row_start,
-        row_end=args.row_end
-    )
\ No newline at end of file
+    from candidate_classification_project.nlp_script import check_nltk_resources
+    check_nltk_resources()
+
+    with profiling.profile_run(args.profile, OUTPUT_FILE):
+        main(
+            file_name=args.file_name,
+            api_key=args.api_key,
+            row_start=args.row_start,
+            row_end=args.row_end
+        )
@@ -0,0 +1,185 @@
+"""Warm classification service: a local JSON-over-HTTP daemon.
+
+Start it once with `candidate-classify serve` and it keeps the NLTK
+preprocessor, the compiled NLP categories and the OpenAI client (with its
+connection pool) loaded between requests, so each lead only pays for its own
+classification rather than interpreter start, imports and corpus loading.
+
+Endpoints (all JSON):
+
+    GET  /health  -> {"status": "ok"}
+    POST /nlp     -> same columns as nlp_script.process_row, plus '[*] Full name'
+    POST /llm     -> same columns as openai_script.process_llm_responses
+
+POST bodies are either a single lead object ({"[*] Full name": ..., ...}) or a
+list of them; the response has the same shape as the request.
+"""
+import asyncio
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from candidate_classification_project import nlp_script, openai_script
+
+NAME_COLUMN = nlp_script.NAME_COLUMN
+SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+class ServiceUnavailable(RuntimeError):
+    """The server is not configured for this endpoint (answered with 503, not 500)"""
+
+
+class ClassificationService:
+    """Holds the warm state shared by every request the server handles."""
+
+    def __init__(self, categories: dict = None, api_key: str = None,
+                 batch_size: int = 10, concurrency: int = 3):
+        import pandas  # noqa: F401  (load once at startup, not on the first request)
+
+        self.categories = nlp_script.compile_categories(categories or nlp_script.DEFAULT_CATEGORIES)
+        self.api_key = api_key
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        nlp_script.warm_up()
+
+        # LLM calls run on one long-lived event loop so the AsyncOpenAI client
+        # and its HTTP connection pool are reused across requests.
+        self.loop = asyncio.new_event_loop()
+        self.loop_thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.loop_thread.start()
+        self.client = None
+        self.semaphore = None
+        if api_key:
+            asyncio.run_coroutine_threadsafe(self._init_llm(), self.loop).result()
+
+    async def _init_llm(self):
+        from openai import AsyncOpenAI
+
+        self.client = AsyncOpenAI(api_key=self.api_key)
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+
+    def classify_nlp(self, leads: list):
+        import pandas as pd
+
+        results = []
+        for lead in leads:
+            row = pd.Series({k: v for k, v in lead.items() if k not in nlp_script.DROP_COLUMNS})
+            results.append({NAME_COLUMN: lead.get(NAME_COLUMN), **nlp_script.process_row(row, self.categories)})
+        return results
+
+    def classify_llm(self, leads: list):
+        import pandas as pd
+
+        if self.client is None:
+            raise ServiceUnavailable("LLM classification needs an API key (--api_key or OPEN_API_KEY)")
+
+        df = pd.DataFrame(leads)
+        df = df.drop(columns=nlp_script.DROP_COLUMNS, errors="ignore")
+        batches = [df.iloc[i:i + self.batch_size] for i in range(0, len(df), self.batch_size)]
+
+        async def run_batches():
+            return await asyncio.gather(*[
+                openai_script.get_chatgpt_batch_response(
+                    self.client, openai_script.build_batch_prompts(df, batch), batch_idx, self.semaphore
+                )
+                for batch_idx, batch in enumerate(batches)
+            ])
+
+        results = asyncio.run_coroutine_threadsafe(run_batches(), self.loop).result()
+
+        records = []
+        for batch_idx, responses, token_info in results:
+            if "error" in token_info:
+                raise RuntimeError(f"LLM batch {batch_idx} failed: {token_info['error']}")
+            records.extend(nlp_script.to_records(openai_script.combine_batch_output(batches[batch_idx], responses)))
+        return records
+
+    def close(self):
+        if self.client is not None:
+            asyncio.run_coroutine_threadsafe(self.client.close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.loop_thread.join()
+
+
+class ClassificationHandler(BaseHTTPRequestHandler):
+    """Routes JSON requests to the server's ClassificationService."""
+
+    routes = {
+        "/nlp": "classify_nlp",
+        "/llm": "classify_llm",
+    }
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_json(200, {"status": "ok"})
+        else:
+            self.send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        method = self.routes.get(self.path)
+        if method is None:
+            self.send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"null")
+        except (ValueError, json.JSONDecodeError) as e:
+            self.send_json(400, {"error": f"Invalid JSON body: {e}"})
+            return
+
+        single = isinstance(payload, dict)
+        leads = [payload] if single else payload
+        if not isinstance(leads, list) or not all(isinstance(lead, dict) for lead in leads):
+            self.send_json(400, {"error": "Body must be a lead object or a list of lead objects"})
+            return
+        for i, lead in enumerate(leads):
+            bad = [key for key, value in lead.items() if not isinstance(value, SCALAR_TYPES)]
+            if bad:
+                self.send_json(400, {"error": f"Lead {i}: fields must be strings, numbers, booleans or null: {bad}"})
+                return
+
+        try:
+            results = getattr(self.server.service, method)(leads)
+        except ServiceUnavailable as e:
+            self.send_json(503, {"error": str(e)})
+            return
+        except Exception as e:
+            print(f"❌ Error in {self.path}: {e}")
+            self.send_json(500, {"error": str(e)})
+            return
+
+        self.send_json(200, results[0] if single and results else results)
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765, api_key: str = None,
+          batch_size: int = 10, concurrency: int = 3):
+    """Start the warm service and block until interrupted. NLTK resources are checked by the CLI preflight."""
+    service = ClassificationService(api_key=api_key, batch_size=batch_size, concurrency=concurrency)
+
+    server = ThreadingHTTPServer((host, port), ClassificationHandler)
+    server.service = service
+    print(f"🚀 Classification service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        print("🏁 Classification service stopped")
+
+
+if __name__ == "__main__":
+    from candidate_classification_project.cli import main
+
+    main(["serve", *sys.argv[1:]])
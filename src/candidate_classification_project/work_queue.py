@@ -0,0 +1,375 @@
+"""Shared work queue for spreading NLP chunks and LLM batches over many workers.
+
+The queue is a single SQLite file. `submit` splits a leads file into jobs (NLP
+chunks and/or LLM batches, the same units process_nlp_responses and
+process_llm_responses work in) and stores each job's rows in the file itself, so
+workers only need the queue path, not the original workbook. Any number of
+`work` processes, on this host or others that can see the file, then lease jobs
+one at a time:
+
+- a lease expires after `lease_seconds`; a job whose worker died is handed out again
+- a failed job goes back to pending until it has been tried `max_attempts` times
+- a result is only committed while the worker still holds the job's lease token,
+  so each job's result is written exactly once even if a lease expired and the
+  job was re-run elsewhere
+
+`merge` then stitches the committed results into the single output workbook,
+aligning NLP and LLM rows on their position in the source file.
+
+Cell values travel through the queue as JSON. Dates, datetimes and times are
+tagged and restored, so they reach the workbook as dates again; any other
+non-JSON value is stored as its string form.
+
+When sharing the queue between hosts, put it on a filesystem with working POSIX
+locks (SQLite's default rollback journal is used, not WAL, for that reason).
+"""
+import asyncio
+import datetime
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+
+from candidate_classification_project import nlp_script, openai_script
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    row_start INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_token TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_expires);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+TYPE_TAG = "__type__"
+TEMPORAL_TYPES = {"datetime": datetime.datetime, "date": datetime.date, "time": datetime.time}
+
+
+def encode_value(value):
+    """json.dumps default: tag temporal values so decode_object can restore them"""
+    for name, cls in TEMPORAL_TYPES.items():
+        if isinstance(value, cls):
+            return {TYPE_TAG: name, "value": value.isoformat()}
+    return str(value)
+
+
+def decode_object(obj):
+    """json.loads object_hook: undo encode_value's tagging"""
+    if obj.keys() == {TYPE_TAG, "value"} and obj[TYPE_TAG] in TEMPORAL_TYPES:
+        return TEMPORAL_TYPES[obj[TYPE_TAG]].fromisoformat(obj["value"])
+    return obj
+
+
+def dumps(records):
+    return json.dumps(records, default=encode_value)
+
+
+def loads(payload):
+    return json.loads(payload, object_hook=decode_object)
+
+
+class Job:
+    """A leased job: its rows, and the token that proves the lease is still ours."""
+
+    def __init__(self, job_id, kind, row_start, records, lease_token):
+        self.id = job_id
+        self.kind = kind
+        self.row_start = row_start
+        self.records = records
+        self.lease_token = lease_token
+
+
+class WorkQueue:
+    """SQLite-backed job store with leases, retries and exactly-once result commit."""
+
+    def __init__(self, path: str, lease_seconds: float = 600, max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # isolation_level=None: transactions are managed explicitly below
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """BEGIN IMMEDIATE takes the write lock up front, so two workers never lease the same job"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    # --- Producer side ---
+    def submit(self, file_name: str, kinds=("nlp", "llm"), chunk_size: int = 500, batch_size: int = 10,
+               row_start: int = None, row_end: int = None, categories: dict = None):
+        """Split a leads file into NLP chunks / LLM batches and enqueue them. Returns jobs added.
+
+        A queue holds one submission: submitting into a queue that already has
+        jobs raises RuntimeError rather than queueing every row a second time.
+        """
+        import pandas as pd
+
+        df = pd.read_excel(file_name, usecols=lambda col: col not in nlp_script.DROP_COLUMNS)
+        if row_start or row_end:
+            df = df.iloc[row_start:row_end]
+        df = df.reset_index(drop=True)
+        offset = row_start or 0
+
+        sizes = {"nlp": chunk_size, "llm": batch_size}
+        jobs = []
+        for kind in kinds:
+            size = sizes[kind]
+            for i in range(0, len(df), size):
+                records = nlp_script.to_records(df.iloc[i:i + size])
+                jobs.append((kind, offset + i, dumps(records)))
+
+        with self.transaction():
+            if self.conn.execute("SELECT 1 FROM jobs LIMIT 1").fetchone() is not None:
+                raise RuntimeError(f"{self.path} already has queued jobs; submit into a new --db")
+            self.conn.execute(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES ('categories', ?)",
+                (json.dumps(categories or nlp_script.DEFAULT_CATEGORIES),)
+            )
+            self.conn.executemany("INSERT INTO jobs (kind, row_start, payload) VALUES (?, ?, ?)", jobs)
+        return len(jobs)
+
+    def categories(self):
+        row = self.conn.execute("SELECT value FROM settings WHERE key = 'categories'").fetchone()
+        return json.loads(row[0]) if row else nlp_script.DEFAULT_CATEGORIES
+
+    # --- Worker side ---
+    def lease(self, owner: str):
+        """Lease the next pending (or lease-expired) job, or return None if there is none right now"""
+        now = time.time()
+        with self.transaction():
+            # Expired leases that have used up their attempts are failed, not re-run
+            self.conn.execute(
+                "UPDATE jobs SET status = 'failed', lease_token = NULL, "
+                "error = COALESCE(error, 'lease expired') "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts)
+            )
+            row = self.conn.execute(
+                "SELECT id, kind, row_start, payload FROM jobs "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY id LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            token = uuid.uuid4().hex
+            self.conn.execute(
+                "UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                "lease_token = ?, lease_expires = ? WHERE id = ?",
+                (owner, token, now + self.lease_seconds, row[0])
+            )
+        job_id, kind, job_row_start, payload = row
+        return Job(job_id, kind, job_row_start, loads(payload), token)
+
+    def complete(self, job: Job, records: list):
+        """Commit a job's result. Returns False if the lease was lost and the result discarded."""
+        with self.transaction():
+            cursor = self.conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_token = NULL "
+                "WHERE id = ? AND status = 'leased' AND lease_token = ?",
+                (dumps(records), job.id, job.lease_token)
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job: Job, error: str):
+        """Return a job to pending for retry, or mark it failed once out of attempts"""
+        with self.transaction():
+            self.conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = ?, lease_token = NULL, lease_expires = NULL "
+                "WHERE id = ? AND status = 'leased' AND lease_token = ?",
+                (self.max_attempts, error, job.id, job.lease_token)
+            )
+
+    def retry_failed(self):
+        """Reset failed jobs to pending with a fresh set of attempts. Returns jobs reset."""
+        with self.transaction():
+            cursor = self.conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = 0 WHERE status = 'failed'"
+            )
+        return cursor.rowcount
+
+    def status_counts(self):
+        """{kind: {status: count}}"""
+        counts = {}
+        for kind, status, count in self.conn.execute(
+            "SELECT kind, status, COUNT(*) FROM jobs GROUP BY kind, status"
+        ):
+            counts.setdefault(kind, {})[status] = count
+        return counts
+
+    def has_open_jobs(self):
+        row = self.conn.execute(
+            "SELECT 1 FROM jobs WHERE status IN ('pending', 'leased') LIMIT 1"
+        ).fetchone()
+        return row is not None
+
+    def results(self, kind: str):
+        """All committed records of one kind, in source row order"""
+        return self.indexed_results(kind)[1]
+
+    def indexed_results(self, kind: str):
+        """(source rows, records) for one kind; record i came from source row source_rows[i]"""
+        source_rows, records = [], []
+        for row_start, result in self.conn.execute(
+            "SELECT row_start, result FROM jobs WHERE kind = ? AND status = 'done' ORDER BY row_start", (kind,)
+        ):
+            job_records = loads(result)
+            source_rows.extend(range(row_start, row_start + len(job_records)))
+            records.extend(job_records)
+        return source_rows, records
+
+
+def run_nlp_job(job: Job, categories):
+    import pandas as pd
+
+    results = nlp_script.classify_frame(pd.DataFrame(job.records), categories)
+    return nlp_script.to_records(results.to_frame())
+
+
+def run_llm_job(job: Job, client, loop):
+    import pandas as pd
+
+    batch = pd.DataFrame(job.records)
+    prompt = openai_script.build_batch_prompts(batch, batch)
+    _, responses, token_info = loop.run_until_complete(
+        openai_script.get_chatgpt_batch_response(client, prompt, job.row_start, asyncio.Semaphore(1))
+    )
+    if "error" in token_info:
+        raise RuntimeError(token_info["error"])
+    return nlp_script.to_records(openai_script.combine_batch_output(batch, responses))
+
+
+def run_worker(db_path: str, api_key: str = None, lease_seconds: float = 600, max_attempts: int = 3,
+               poll_interval: float = 5.0, wait: bool = False):
+    """Lease and run jobs until the queue is drained (or forever, with wait=True)."""
+    queue = WorkQueue(db_path, lease_seconds=lease_seconds, max_attempts=max_attempts)
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    compiled = nlp_script.compile_categories(queue.categories())
+    loop = asyncio.new_event_loop()
+    client = None
+    done = 0
+
+    print(f"🚀 Worker {owner} started on {db_path}")
+    try:
+        while True:
+            job = queue.lease(owner)
+            if job is None:
+                if not wait and not queue.has_open_jobs():
+                    break
+                # Other workers still hold leases that may expire and need re-running
+                time.sleep(poll_interval)
+                continue
+
+            try:
+                if job.kind == "nlp":
+                    records = run_nlp_job(job, compiled)
+                else:
+                    if client is None:
+                        from openai import AsyncOpenAI
+
+                        client = AsyncOpenAI(api_key=api_key)
+                    records = run_llm_job(job, client, loop)
+            except Exception as e:
+                print(f"❌ Error in {job.kind} job {job.id} (rows from {job.row_start}): {e}")
+                queue.fail(job, str(e))
+                continue
+
+            if queue.complete(job, records):
+                done += 1
+                print(f"✅ {job.kind} job {job.id} done | rows from {job.row_start} | {len(records)} rows")
+            else:
+                print(f"⚠️ Lease on {job.kind} job {job.id} expired before commit; result discarded")
+    finally:
+        if client is not None:
+            loop.run_until_complete(client.close())
+        loop.close()
+        queue.close()
+
+    print(f"🏁 Worker {owner} finished: {done} jobs committed")
+    return done
+
+
+def run_workers(db_path: str, processes: int = 1, **worker_kwargs):
+    """Start `processes` local workers and wait for them all to finish."""
+    if processes <= 1:
+        run_worker(db_path, **worker_kwargs)
+        return
+
+    import multiprocessing
+
+    workers = [
+        multiprocessing.Process(target=run_worker, args=(db_path,), kwargs=worker_kwargs)
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def merge_results(db_path: str, output_file: str = "all_columns.xlsx", allow_partial: bool = False):
+    """Write all committed results to a single workbook, joining NLP and LLM columns by source row."""
+    import pandas as pd
+
+    queue = WorkQueue(db_path)
+    try:
+        counts = queue.status_counts()
+        unfinished = {
+            kind: {status: n for status, n in statuses.items() if status != "done"}
+            for kind, statuses in counts.items()
+        }
+        unfinished = {kind: statuses for kind, statuses in unfinished.items() if statuses}
+        if unfinished and not allow_partial:
+            raise RuntimeError(f"Queue has unfinished jobs: {unfinished}")
+
+        # Index each kind by source row; with allow_partial a kind may have no
+        # committed results at all, so leave it out
+        frames = {}
+        for kind in counts:
+            source_rows, records = queue.indexed_results(kind)
+            if records:
+                frames[kind] = pd.DataFrame(records, index=source_rows)
+    finally:
+        queue.close()
+
+    if "nlp" in frames and "llm" in frames:
+        nlp_df, llm_df = frames["nlp"], frames["llm"]
+        final_df = nlp_df.join(llm_df.drop(columns=[col for col in llm_df.columns if col in nlp_df.columns]),
+                               how="inner")
+    elif frames:
+        final_df = next(iter(frames.values()))
+    else:
+        raise RuntimeError(f"No committed results in {db_path}")
+    final_df = final_df.sort_index().reset_index(drop=True)
+
+    final_df.to_excel(output_file, index=False)
+    print(f"✅ Done! Saved to {output_file}")
+    return final_df
@@ -8,7 +8,7 @@ from PyQt6.QtWidgets import (
     QHBoxLayout, QLineEdit, QRadioButton, QButtonGroup
 )
 from PyQt6.QtCore import Qt
-from src.candidate_classification_project.nlp_script import process_nlp_responses
+from src.candidate_classification_project.nlp_script import DROP_COLUMNS, classify_frame
 
 logging.basicConfig(
     level=logging.INFO,
@@ -306,40 +306,20 @@ class NLPApp(QWidget):
 
         self.output_box.append("Running NLP processing...")
 
-        # Save the original DataFrame to a temp file
-        temp_file = os.path.join(os.path.expanduser("~"), "Desktop", "temp_filtered.xlsx")
-        self.df_original.to_excel(temp_file, index=False)
-
-        # Run NLP on the full dataset
-        df_nlp_output = process_nlp_responses(
-            file_name=temp_file,
-            categories=self.nlp_categories
-        )
-
-        # --- ✅ Merge NLP results with original data ---
-        if isinstance(df_nlp_output, pd.DataFrame):
-            # Try to align by index or a shared key if available
-            if len(df_nlp_output) == len(self.df_original):
-                self.df_nlp = pd.concat([self.df_original.reset_index(drop=True),
-                                        df_nlp_output.reset_index(drop=True)], axis=1)
-            else:
-                # If lengths differ, try a left join by a shared ID column (customize if needed)
-                common_cols = list(set(self.df_original.columns) & set(df_nlp_output.columns))
-                if common_cols:
-                    self.df_nlp = pd.merge(self.df_original, df_nlp_output, on=common_cols, how="left")
-                else:
-                    # Fallback to concatenation with best effort
-                    self.df_nlp = pd.concat([self.df_original.reset_index(drop=True),
-                                            df_nlp_output.reset_index(drop=True)], axis=1)
-            if '[*] Full name' in self.df_nlp.columns and 'Full name' not in self.df_nlp.columns:
-                self.df_nlp = self.df_nlp.rename(columns={'[*] Full name': 'Full name'})
-            if '[>] Country' in self.df_nlp.columns and 'Country' not in self.df_nlp.columns:
-                self.df_nlp = self.df_nlp.rename(columns={'[>] Country': 'Country'})
-            if '[>] City' in self.df_nlp.columns and 'City' not in self.df_nlp.columns:
-                self.df_nlp = self.df_nlp.rename(columns={'[>] City': 'City'})
-        else:
-            self.output_box.append("⚠️ NLP function did not return a valid DataFrame.")
-            return
+        # Run NLP on the full dataset; only the category columns are materialized,
+        # the original frame already carries the name and profile columns
+        nlp_input = self.df_original.drop(columns=DROP_COLUMNS, errors="ignore")
+        results = classify_frame(nlp_input, self.nlp_categories)
+        del nlp_input
+
+        self.df_nlp = pd.concat([self.df_original.reset_index(drop=True),
+                                results.to_frame(include_name=False)], axis=1)
+        if '[*] Full name' in self.df_nlp.columns and 'Full name' not in self.df_nlp.columns:
+            self.df_nlp = self.df_nlp.rename(columns={'[*] Full name': 'Full name'})
+        if '[>] Country' in self.df_nlp.columns and 'Country' not in self.df_nlp.columns:
+            self.df_nlp = self.df_nlp.rename(columns={'[>] Country': 'Country'})
+        if '[>] City' in self.df_nlp.columns and 'City' not in self.df_nlp.columns:
+            self.df_nlp = self.df_nlp.rename(columns={'[>] City': 'City'})
 
         self.output_box.append(f"NLP processing done: {len(self.df_nlp)} rows, {len(self.df_nlp.columns)} columns")
         self.post_filter_btn.setEnabled(True)
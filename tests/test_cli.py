@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from candidate_classification_project import cli, nlp_script
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def test_cli_import_and_parse_leave_heavy_modules_unloaded():
+    code = (
+        "import sys\n"
+        "import candidate_classification_project.cli as cli\n"
+        "for argv in (['nlp'], ['llm', '--row_end', '5'], ['both'], ['serve'], ['queue', 'work']):\n"
+        "    cli.build_parser().parse_args(argv)\n"
+        "print(sorted(m for m in ('pandas', 'nltk', 'openai', 'tqdm') if m in sys.modules))\n"
+    )
+    # A fresh interpreter, so modules imported by other tests don't leak in
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        env={**os.environ, "PYTHONPATH": str(SRC)}
+    )
+    assert out.stdout.strip() == "[]"
+
+
+def test_preflight_nltk_exits_and_names_missing_resources(monkeypatch, capsys):
+    monkeypatch.setattr(nlp_script, "missing_nltk_resources", lambda: ["punkt_tab", "wordnet"])
+
+    with pytest.raises(SystemExit) as exc:
+        cli.preflight_nltk()
+
+    assert exc.value.code == 1
+    err = capsys.readouterr().err
+    assert "punkt_tab" in err and "wordnet" in err
+
+
+def test_preflight_nltk_passes_when_resources_present(monkeypatch):
+    monkeypatch.setattr(nlp_script, "missing_nltk_resources", lambda: [])
+
+    cli.preflight_nltk()
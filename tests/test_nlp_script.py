@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from candidate_classification_project import nlp_script
+
+
+@pytest.fixture(autouse=True)
+def stub_preprocess(monkeypatch):
+    """Keep the tests independent of the NLTK corpora being installed"""
+    monkeypatch.setattr(
+        nlp_script, "preprocess", lambda text: text.lower() if isinstance(text, str) else ""
+    )
+
+
+def old_process_nlp(df, categories):
+    """The row-wise output process_nlp_responses produced before NLPResults"""
+    results = df.apply(lambda row: nlp_script.process_row(row, categories), axis=1, result_type="expand")
+    df_out = pd.concat([df, results], axis=1)
+    columns = [nlp_script.NAME_COLUMN] + list(categories) + [f"{cat} Terms Found" for cat in categories]
+    return df_out[[col for col in columns if col in df_out.columns]]
+
+
+def test_classify_frame_matches_process_row():
+    df = pd.DataFrame({
+        nlp_script.NAME_COLUMN: ["Ann", "Bob", "Cy", np.nan],
+        "Path to impact": ["I led a team on AGI safety", np.nan, "Equity and justice work", "80k hours"],
+        "Notes": [np.nan, "Managed a program", "GWWC member", np.nan],
+        "Years": [3, np.nan, 10, 1],
+    })
+    expected = old_process_nlp(df.copy(), nlp_script.DEFAULT_CATEGORIES)
+
+    results = nlp_script.classify_frame(df.copy(), nlp_script.DEFAULT_CATEGORIES)
+
+    assert results.mask.dtype == np.uint8
+    pd.testing.assert_frame_equal(results.to_frame(), expected)
+
+
+def test_classify_frame_uint64_mask_with_64_categories():
+    categories = {f"cat{i}": [f"kw{i:02d}x"] for i in range(64)}
+    df = pd.DataFrame({
+        nlp_script.NAME_COLUMN: ["a", "b", "c"],
+        "Text": ["kw00x kw63x", "kw31x", np.nan],
+    })
+    expected = old_process_nlp(df.copy(), categories)
+
+    results = nlp_script.classify_frame(df.copy(), categories)
+
+    assert results.mask.dtype == np.uint64
+    assert results.mask.tolist() == [1 | (1 << 63), 1 << 31, 0]
+    pd.testing.assert_frame_equal(results.to_frame(), expected)
+
+
+def test_classify_frame_interns_repeated_terms():
+    df = pd.DataFrame({"Text": ["justice", "justice", "nothing", "justice"]})
+
+    results = nlp_script.classify_frame(df, {"Social": ["justice"]})
+
+    assert results.term_values["Social"] == ["", "justice"]
+    assert results.term_codes["Social"].tolist() == [1, 1, 0, 1]
+
+
+def test_classify_frame_empty():
+    df = pd.DataFrame({nlp_script.NAME_COLUMN: [], "Text": []}, dtype=object)
+
+    out = nlp_script.classify_frame(df, nlp_script.DEFAULT_CATEGORIES).to_frame()
+
+    categories = list(nlp_script.DEFAULT_CATEGORIES)
+    assert len(out) == 0
+    assert list(out.columns) == (
+        [nlp_script.NAME_COLUMN] + categories + [f"{cat} Terms Found" for cat in categories]
+    )
+
+
+def test_mask_dtype_rejects_more_than_64_categories():
+    with pytest.raises(ValueError):
+        nlp_script.mask_dtype(65)
@@ -0,0 +1,53 @@
+import asyncio
+import json
+import sys
+import types
+
+import pandas as pd
+import pytest
+
+from candidate_classification_project import openai_script
+from candidate_classification_project.nlp_script import NAME_COLUMN
+
+
+class FakeCompletions:
+    async def create(self, model, messages):
+        # One response object per "**[*] Full name**" profile in the prompt
+        n = messages[-1]["content"].count(f"**{NAME_COLUMN}**")
+        content = json.dumps([{"Summary": "s", "Career_Goals": "g"}] * n)
+        message = types.SimpleNamespace(content=content)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)], usage=None)
+
+
+class FakeAsyncOpenAI:
+    def __init__(self, api_key=None):
+        self.chat = types.SimpleNamespace(completions=FakeCompletions())
+
+
+@pytest.fixture
+def stub_llm(monkeypatch, tmp_path):
+    """Stand in for the openai and tqdm packages and run in a scratch directory"""
+    monkeypatch.setitem(sys.modules, "openai", types.SimpleNamespace(AsyncOpenAI=FakeAsyncOpenAI))
+    tqdm_asyncio = types.SimpleNamespace(tqdm_asyncio=types.SimpleNamespace(gather=asyncio.gather))
+    monkeypatch.setitem(sys.modules, "tqdm", types.ModuleType("tqdm"))
+    monkeypatch.setitem(sys.modules, "tqdm.asyncio", tqdm_asyncio)
+    monkeypatch.chdir(tmp_path)
+
+
+def test_process_llm_responses_returns_only_this_run(stub_llm, tmp_path):
+    leads = tmp_path / "leads.xlsx"
+    pd.DataFrame({NAME_COLUMN: [f"p{i}" for i in range(8)], "Path to impact": ["x"] * 8}).to_excel(leads, index=False)
+
+    def run():
+        return asyncio.run(openai_script.process_llm_responses(
+            str(leads), api_key="key", batch_size=2, row_start=0, row_end=5
+        ))
+
+    first = run()
+    second = run()
+
+    assert second[NAME_COLUMN].tolist() == [f"p{i}" for i in range(5)]
+    assert second["Summary"].tolist() == ["s"] * 5
+    pd.testing.assert_frame_equal(first, second)
+    # The incremental workbook still accumulates across runs
+    assert len(pd.read_excel(tmp_path / openai_script.OUTPUT_FILE)) == 10
@@ -0,0 +1,27 @@
+import tracemalloc
+
+from candidate_classification_project import profiling
+
+
+def test_stage_is_shared_noop_when_off():
+    assert profiling.stage("read_excel") is profiling.stage("to_excel")
+
+
+def test_snapshots_only_first_call_of_top_level_stages(tmp_path, monkeypatch):
+    snapshots = []
+    take_snapshot = tracemalloc.take_snapshot
+    monkeypatch.setattr(tracemalloc, "take_snapshot", lambda: snapshots.append(1) or take_snapshot())
+
+    with profiling.profile_run(True, str(tmp_path / "results.xlsx")) as profiler:
+        for _ in range(50):
+            with profiling.stage("to_excel"):
+                with profiling.stage("nested"):
+                    pass
+
+    # before + after for the first top-level call only
+    assert len(snapshots) == 2
+    assert profiler.stats["to_excel"].calls == 50
+    assert profiler.stats["nested"].calls == 50
+    assert (tmp_path / "results_profile.txt").exists()
+    assert (tmp_path / "results_profile.collapsed").exists()
+    assert profiling.stage("to_excel") is profiling.stage("other")
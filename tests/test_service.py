@@ -0,0 +1,99 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from candidate_classification_project import nlp_script
+from candidate_classification_project.service import ClassificationHandler, ClassificationService
+
+NAME = nlp_script.NAME_COLUMN
+
+
+@pytest.fixture
+def base_url(monkeypatch):
+    """A live server on a free port, without an API key"""
+    monkeypatch.setattr(
+        nlp_script, "preprocess", lambda text: text.lower() if isinstance(text, str) else ""
+    )
+    service = ClassificationService()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ClassificationHandler)
+    server.service = service
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def request(url, body=None):
+    """Return (status, parsed JSON); body may be bytes or a JSON-able object"""
+    if body is not None and not isinstance(body, bytes):
+        body = json.dumps(body).encode("utf-8")
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=body)) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def expected_row(lead):
+    row = pd.Series({k: v for k, v in lead.items() if k not in nlp_script.DROP_COLUMNS})
+    return {NAME: lead.get(NAME), **nlp_script.process_row(row, nlp_script.DEFAULT_CATEGORIES)}
+
+
+LEADS = [
+    {NAME: "Ann", "Path to impact": "I led work on AGI safety", "Years": 4},
+    {NAME: "Bob", "Path to impact": None, "Email": "justice@example.com"},
+]
+
+
+def test_health(base_url):
+    assert request(f"{base_url}/health") == (200, {"status": "ok"})
+
+
+def test_nlp_single_lead_returns_object(base_url):
+    status, body = request(f"{base_url}/nlp", LEADS[0])
+
+    assert status == 200
+    assert body == expected_row(LEADS[0])
+    assert list(body) == [NAME] + list(nlp_script.process_row(pd.Series(LEADS[0]), nlp_script.DEFAULT_CATEGORIES))
+
+
+def test_nlp_batch_returns_list(base_url):
+    status, body = request(f"{base_url}/nlp", LEADS)
+
+    assert status == 200
+    assert body == [expected_row(lead) for lead in LEADS]
+
+
+def test_nlp_ignores_drop_columns(base_url):
+    # "justice" only appears in Email, which is dropped before classification
+    status, body = request(f"{base_url}/nlp", LEADS[1])
+
+    assert status == 200
+    assert body["Social"] is False
+    assert body["Social Terms Found"] == ""
+
+
+@pytest.mark.parametrize("body", [b"{not json", b"42", [1, 2], {"x": [1, 2]}, [{"x": {"y": 1}}]])
+def test_bad_body_is_400(base_url, body):
+    status, response = request(f"{base_url}/nlp", body)
+
+    assert status == 400
+    assert "error" in response
+
+
+def test_llm_without_api_key_is_503(base_url):
+    status, body = request(f"{base_url}/llm", LEADS[0])
+
+    assert status == 503
+    assert "API key" in body["error"]
+
+
+def test_unknown_path_is_404(base_url):
+    assert request(f"{base_url}/nope", LEADS[0])[0] == 404
@@ -0,0 +1,194 @@
+import datetime
+import json
+import time
+
+import pandas as pd
+import pytest
+
+from candidate_classification_project.nlp_script import NAME_COLUMN
+from candidate_classification_project.work_queue import WorkQueue, merge_results
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "queue.sqlite")
+
+
+def add_jobs(queue, jobs):
+    """Insert (kind, row_start, records) jobs directly, without reading a workbook"""
+    with queue.transaction():
+        queue.conn.executemany(
+            "INSERT INTO jobs (kind, row_start, payload) VALUES (?, ?, ?)",
+            [(kind, row_start, json.dumps(records)) for kind, row_start, records in jobs]
+        )
+
+
+def lease_all(queue, owner="worker"):
+    jobs = []
+    while (job := queue.lease(owner)) is not None:
+        jobs.append(job)
+    return jobs
+
+
+def test_expired_lease_is_released_and_stale_commit_rejected(db_path):
+    queue = WorkQueue(db_path, lease_seconds=0.05)
+    add_jobs(queue, [("nlp", 0, [{"a": 1}])])
+
+    stale = queue.lease("worker-1")
+    assert queue.lease("worker-2") is None  # still leased
+    time.sleep(0.1)
+
+    fresh = queue.lease("worker-2")
+    assert fresh.id == stale.id
+    assert fresh.lease_token != stale.lease_token
+
+    assert queue.complete(stale, [{"from": "stale"}]) is False
+    assert queue.complete(fresh, [{"from": "fresh"}]) is True
+    assert queue.complete(fresh, [{"from": "again"}]) is False
+    assert queue.results("nlp") == [{"from": "fresh"}]
+
+
+def test_fail_retries_until_max_attempts(db_path):
+    queue = WorkQueue(db_path, max_attempts=2)
+    add_jobs(queue, [("llm", 0, [{"a": 1}])])
+
+    queue.fail(queue.lease("worker"), "first")
+    assert queue.status_counts() == {"llm": {"pending": 1}}
+
+    queue.fail(queue.lease("worker"), "second")
+    assert queue.status_counts() == {"llm": {"failed": 1}}
+    assert queue.lease("worker") is None
+    assert not queue.has_open_jobs()
+
+
+def test_expired_lease_out_of_attempts_is_failed(db_path):
+    queue = WorkQueue(db_path, lease_seconds=0.05, max_attempts=1)
+    add_jobs(queue, [("nlp", 0, [{"a": 1}])])
+
+    queue.lease("worker")
+    time.sleep(0.1)
+
+    assert queue.lease("worker") is None
+    assert queue.status_counts() == {"nlp": {"failed": 1}}
+
+
+def test_retry_failed_resets_attempts(db_path):
+    queue = WorkQueue(db_path, max_attempts=1)
+    add_jobs(queue, [("nlp", 0, [{"a": 1}]), ("nlp", 1, [{"a": 2}])])
+    for job in lease_all(queue):
+        queue.fail(job, "boom")
+    assert queue.status_counts() == {"nlp": {"failed": 2}}
+
+    assert queue.retry_failed() == 2
+    jobs = lease_all(queue)
+    assert len(jobs) == 2
+    for job in jobs:
+        assert queue.complete(job, job.records)
+    assert queue.status_counts() == {"nlp": {"done": 2}}
+
+
+def test_submit_twice_is_refused(db_path, tmp_path):
+    leads = tmp_path / "leads.xlsx"
+    pd.DataFrame({
+        NAME_COLUMN: ["Ann", "Bob", "Cy"],
+        "Email": ["a@x", "b@x", "c@x"],
+        "Path to impact": ["justice", "agi safety", "none"],
+    }).to_excel(leads, index=False)
+    queue = WorkQueue(db_path)
+
+    assert queue.submit(str(leads), chunk_size=2, batch_size=2) == 4
+    with pytest.raises(RuntimeError):
+        queue.submit(str(leads), chunk_size=2, batch_size=2)
+
+    assert queue.status_counts() == {"nlp": {"pending": 2}, "llm": {"pending": 2}}
+    job = queue.lease("worker")
+    assert "Email" not in job.records[0]
+
+
+def test_merge_results_orders_rows_and_joins_kinds(db_path, tmp_path):
+    queue = WorkQueue(db_path)
+    add_jobs(queue, [
+        ("nlp", 2, [{NAME_COLUMN: "Cy", "Social": True}]),
+        ("nlp", 0, [{NAME_COLUMN: "Ann", "Social": False}, {NAME_COLUMN: "Bob", "Social": True}]),
+        ("llm", 0, [{NAME_COLUMN: "Ann", "Summary": "a"}, {NAME_COLUMN: "Bob", "Summary": "b"}]),
+        ("llm", 2, [{NAME_COLUMN: "Cy", "Summary": "c"}]),
+    ])
+    for job in reversed(lease_all(queue)):
+        queue.complete(job, job.records)
+    queue.close()
+
+    final_df = merge_results(db_path, output_file=str(tmp_path / "out.xlsx"))
+
+    assert final_df[NAME_COLUMN].tolist() == ["Ann", "Bob", "Cy"]
+    assert final_df["Summary"].tolist() == ["a", "b", "c"]
+    assert pd.read_excel(tmp_path / "out.xlsx")[NAME_COLUMN].tolist() == ["Ann", "Bob", "Cy"]
+
+
+def test_merge_results_partial(db_path, tmp_path):
+    queue = WorkQueue(db_path, max_attempts=1)
+    add_jobs(queue, [
+        ("nlp", 0, [{NAME_COLUMN: "Ann", "Social": False}]),
+        ("llm", 0, [{NAME_COLUMN: "Ann", "Summary": "a"}]),
+    ])
+    for job in lease_all(queue):
+        if job.kind == "nlp":
+            queue.complete(job, job.records)
+        else:
+            queue.fail(job, "api down")
+    queue.close()
+
+    with pytest.raises(RuntimeError):
+        merge_results(db_path, output_file=str(tmp_path / "out.xlsx"))
+
+    final_df = merge_results(db_path, output_file=str(tmp_path / "out.xlsx"), allow_partial=True)
+    assert final_df.to_dict("records") == [{NAME_COLUMN: "Ann", "Social": False}]
+
+
+def test_merge_results_partial_with_nothing_committed(db_path, tmp_path):
+    queue = WorkQueue(db_path)
+    add_jobs(queue, [("llm", 0, [{NAME_COLUMN: "Ann"}])])
+    queue.close()
+
+    with pytest.raises(RuntimeError):
+        merge_results(db_path, output_file=str(tmp_path / "out.xlsx"), allow_partial=True)
+
+
+def test_merge_results_aligns_duplicate_and_missing_names_by_source_row(db_path, tmp_path):
+    queue = WorkQueue(db_path)
+    names = ["A", None, "A", None, "B"]
+    add_jobs(queue, [
+        ("nlp", 0, [{NAME_COLUMN: name, "Social": i % 2 == 0} for i, name in enumerate(names[:3])]),
+        ("nlp", 3, [{NAME_COLUMN: name, "Social": i % 2 == 1} for i, name in enumerate(names[3:])]),
+        ("llm", 0, [{NAME_COLUMN: name, "Summary": f"s{i}"} for i, name in enumerate(names[:2])]),
+        ("llm", 2, [{NAME_COLUMN: name, "Summary": f"s{i + 2}"} for i, name in enumerate(names[2:])]),
+    ])
+    for job in lease_all(queue):
+        queue.complete(job, job.records)
+    queue.close()
+
+    final_df = merge_results(db_path, output_file=str(tmp_path / "out.xlsx"))
+
+    assert len(final_df) == 5
+    assert final_df[NAME_COLUMN].tolist()[::2] == ["A", "A", "B"]
+    assert final_df[NAME_COLUMN].isna().tolist() == [False, True, False, True, False]
+    assert final_df["Summary"].tolist() == ["s0", "s1", "s2", "s3", "s4"]
+    assert list(final_df.columns) == [NAME_COLUMN, "Social", "Summary"]
+
+
+def test_dates_survive_the_queue(db_path, tmp_path):
+    leads = tmp_path / "leads.xlsx"
+    applied = [pd.Timestamp("2024-01-02 10:30"), pd.Timestamp("2024-03-04")]
+    pd.DataFrame({NAME_COLUMN: ["Ann", "Bob"], "Applied": applied}).to_excel(leads, index=False)
+    queue = WorkQueue(db_path)
+    queue.submit(str(leads), kinds=("llm",), batch_size=1)
+
+    for job in lease_all(queue):
+        assert isinstance(job.records[0]["Applied"], datetime.datetime)
+        queue.complete(job, [{**record, "Summary": "s"} for record in job.records])
+    queue.close()
+
+    merge_results(db_path, output_file=str(tmp_path / "out.xlsx"))
+
+    out = pd.read_excel(tmp_path / "out.xlsx")
+    assert pd.api.types.is_datetime64_any_dtype(out["Applied"])
+    assert out["Applied"].tolist() == applied